@@ -5,10 +5,35 @@ Queries GA4 property data using a service account.
 """
 
 import argparse
+import csv
+import functools
+import io
 import json
 import sys
 import os
+import threading
+import time
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from itertools import chain, groupby
+from operator import attrgetter
+
+from google.api_core.exceptions import ResourceExhausted
+from google.analytics.data_v1beta import BetaAnalyticsDataClient
+from google.analytics.data_v1beta.types import (
+    DateRange, Dimension, Metric, OrderBy, RunRealtimeReportRequest, RunReportRequest
+)
+
+try:
+    import orjson
+except ImportError:  # optional; falls back to the stdlib encoder
+    orjson = None
+
+try:
+    import pyarrow
+except ImportError:  # optional; only needed for --output arrow
+    pyarrow = None
 
 # ============================================================
 # CONFIGURATION — Set via environment variables:
@@ -18,6 +43,53 @@ from datetime import datetime, timedelta
 CREDENTIALS_PATH = os.environ.get("GA4_CREDENTIALS_PATH", "")
 PROPERTY_ID = os.environ.get("GA4_PROPERTY_ID", "")
 
+# Point the Google client libraries at the key file once, at import, rather
+# than mutating the environment on every client construction.
+if CREDENTIALS_PATH:
+    os.environ["GOOGLE_APPLICATION_CREDENTIALS"] = CREDENTIALS_PATH
+
+# Response cache TTLs (seconds). GA4 keeps processing a day's data for
+# 24-48 hours, so only ranges ending at least CACHE_SETTLED_DAYS before
+# today are treated as final and cached for the long TTL.
+CACHE_TTL = 60
+CACHE_TTL_CLOSED = 6 * 60 * 60
+CACHE_SETTLED_DAYS = 3
+CACHE_MAX_ENTRIES = 256
+
+# Max concurrent RPCs when fanning out across several properties.
+MAX_WORKERS = 4
+
+# Rows fetched per RPC when paging through large custom reports.
+REPORT_PAGE_SIZE = 10000
+
+# GA4 quotas are per property: allow at most RATE_LIMIT_CALLS RPCs per
+# property in any RATE_LIMIT_PERIOD seconds, and back off exponentially
+# (RETRY_BACKOFF, 2x, 4x, ...) when the API still reports exhaustion.
+RATE_LIMIT_CALLS = 10
+RATE_LIMIT_PERIOD = 1.0
+MAX_RETRIES = 3
+RETRY_BACKOFF = 1.0
+
+# Shared API clients, built on first use. MCP tools call get_client() from
+# worker threads, so construction is guarded to build each channel once.
+_client = None
+_admin_client = None
+_client_lock = threading.Lock()
+
+_report_cache = {}
+_report_cache_lock = threading.Lock()
+
+_recent_calls = defaultdict(deque)
+_recent_calls_lock = threading.Lock()
+
+# Today's date string is recomputed at most this often (seconds).
+DATE_CACHE_TTL = 60
+
+_today_cache = [0.0, ""]
+
+_get_name = attrgetter("name")
+_get_value = attrgetter("value")
+
 
 def get_property_id(args):
     """Get property ID from args or env var."""
@@ -32,90 +104,317 @@ def get_property_id(args):
 
 
 def get_client():
-    """Create and return a GA4 BetaAnalyticsDataClient."""
-    os.environ["GOOGLE_APPLICATION_CREDENTIALS"] = CREDENTIALS_PATH
-    from google.analytics.data_v1beta import BetaAnalyticsDataClient
-    return BetaAnalyticsDataClient()
+    """Return the shared GA4 BetaAnalyticsDataClient (created once per process)."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = BetaAnalyticsDataClient()
+    return _client
 
 
-def build_request(property_id, metrics, dimensions, days=30, start=None, end=None, limit=10, order_by_metric=None, desc=True):
-    """Build a RunReportRequest."""
-    from google.analytics.data_v1beta.types import (
-        RunReportRequest, Metric, Dimension, DateRange, OrderBy
-    )
+def get_admin_client():
+    """Return the shared GA4 AnalyticsAdminServiceClient (created once per process)."""
+    global _admin_client
+    if _admin_client is None:
+        with _client_lock:
+            if _admin_client is None:
+                from google.analytics.admin_v1alpha import AnalyticsAdminServiceClient
+                _admin_client = AnalyticsAdminServiceClient()
+    return _admin_client
+
+
+def _today():
+    """Today's date as YYYY-MM-DD, refreshed at most every DATE_CACHE_TTL seconds."""
+    now = time.monotonic()
+    if now - _today_cache[0] > DATE_CACHE_TTL or not _today_cache[1]:
+        _today_cache[:] = [now, datetime.now().strftime("%Y-%m-%d")]
+    return _today_cache[1]
+
+
+@functools.lru_cache(maxsize=64)
+def _days_before(today, days):
+    """The date `days` days before `today`, both as YYYY-MM-DD."""
+    return (datetime.strptime(today, "%Y-%m-%d") - timedelta(days=days)).strftime("%Y-%m-%d")
 
-    end_date = end or datetime.now().strftime("%Y-%m-%d")
-    if start:
-        start_date = start
-    else:
-        start_date = (datetime.now() - timedelta(days=days)).strftime("%Y-%m-%d")
 
+def _date_range(days=30, start=None, end=None):
+    """DateRange covering `days` days back from today unless start/end are given."""
+    today = _today()
+    return DateRange(start_date=start or _days_before(today, days), end_date=end or today)
+
+
+def _metric_order(metric_name, desc=True):
+    """OrderBy on a metric, descending by default."""
+    return OrderBy(metric=OrderBy.MetricOrderBy(metric_name=metric_name), desc=desc)
+
+
+def build_request(property_id, metrics, dimensions, days=30, start=None, end=None, limit=10, order_by_metric=None, desc=True):
+    """Build a RunReportRequest."""
     request = RunReportRequest(
         property=f"properties/{property_id}",
         metrics=[Metric(name=m.strip()) for m in metrics],
         dimensions=[Dimension(name=d.strip()) for d in dimensions] if dimensions else [],
-        date_ranges=[DateRange(start_date=start_date, end_date=end_date)],
+        date_ranges=[_date_range(days, start, end)],
         limit=limit,
     )
 
     if order_by_metric:
-        request.order_bys = [
-            OrderBy(
-                metric=OrderBy.MetricOrderBy(metric_name=order_by_metric),
-                desc=desc,
-            )
-        ]
+        request.order_bys = [_metric_order(order_by_metric, desc)]
 
     return request
 
 
-def format_response(response, output="table"):
-    """Format the API response into the desired output format."""
-    headers = [h.name for h in response.dimension_headers] + [h.name for h in response.metric_headers]
-    rows = []
-    for row in response.rows:
-        values = [dv.value for dv in row.dimension_values] + [mv.value for mv in row.metric_values]
-        rows.append(values)
+def _template(metrics, dimensions=(), order_bys=()):
+    """Build the fixed part (metrics, dimensions, ordering) of a canned report request."""
+    return RunReportRequest(
+        metrics=[Metric(name=m) for m in metrics],
+        dimensions=[Dimension(name=d) for d in dimensions],
+        order_bys=list(order_bys),
+    )
+
+
+# Canned reports only vary by property, date range and limit, so their
+# requests are cloned from these templates instead of rebuilt per call.
+_OVERVIEW_TEMPLATE = _template(
+    ["totalUsers", "newUsers", "sessions", "screenPageViews",
+     "averageSessionDuration", "engagementRate", "bounceRate"],
+)
+_PAGES_TEMPLATE = _template(
+    ["screenPageViews", "totalUsers", "averageSessionDuration"],
+    ["pagePath", "pageTitle"],
+    [_metric_order("screenPageViews")],
+)
+_SOURCES_TEMPLATE = _template(
+    ["sessions", "totalUsers", "engagementRate", "conversions"],
+    ["sessionSource", "sessionMedium"],
+    [_metric_order("sessions")],
+)
+_COUNTRIES_TEMPLATE = _template(
+    ["sessions", "totalUsers", "engagementRate"],
+    ["country"],
+    [_metric_order("sessions")],
+)
+_DEVICES_TEMPLATE = _template(
+    ["sessions", "totalUsers", "engagementRate"],
+    ["deviceCategory"],
+    [_metric_order("sessions")],
+)
+_PAGES_AND_SOURCES_TEMPLATE = _template(
+    ["screenPageViews"],
+    ["pagePath", "sessionSource", "sessionMedium"],
+    [_metric_order("screenPageViews")],
+)
+_DAILY_TEMPLATE = _template(
+    ["totalUsers", "sessions", "screenPageViews"],
+    ["date"],
+    [OrderBy(dimension=OrderBy.DimensionOrderBy(dimension_name="date"), desc=False)],
+)
+
+
+def build_template_request(template, property_id, days=30, start=None, end=None, limit=10):
+    """Clone a report template and fill in the per-call fields."""
+    request = RunReportRequest()
+    RunReportRequest.copy_from(request, template)
+    request.property = f"properties/{property_id}"
+    request.date_ranges = [_date_range(days, start, end)]
+    request.limit = limit
+    return request
+
+
+def _wait_if_needed(property_name):
+    """Block until another RPC against this property fits in the rate limit."""
+    while True:
+        with _recent_calls_lock:
+            now = time.monotonic()
+            calls = _recent_calls[property_name]
+            while calls and calls[0] <= now - RATE_LIMIT_PERIOD:
+                calls.popleft()
+            if len(calls) < RATE_LIMIT_CALLS:
+                calls.append(now)
+                return
+            delay = calls[0] + RATE_LIMIT_PERIOD - now
+        time.sleep(delay)
+
+
+def _call_with_backoff(rpc, request):
+    """Issue a rate-limited RPC, retrying with exponential backoff on quota errors."""
+    for attempt in range(MAX_RETRIES + 1):
+        _wait_if_needed(request.property)
+        try:
+            return rpc(request)
+        except ResourceExhausted:
+            if attempt == MAX_RETRIES:
+                raise
+            time.sleep(RETRY_BACKOFF * 2 ** attempt)
+
+
+def _run_cached(client, request, ttl=None):
+    """Run a report, reusing a cached response for identical recent requests."""
+    # The serialized request covers property, metrics, dimensions, date
+    # ranges, limit and ordering, so it doubles as a canonical cache key.
+    key = type(request).serialize(request)
+    if ttl is None:
+        settled = _days_before(_today(), CACHE_SETTLED_DAYS - 1)
+        closed = all(dr.end_date < settled for dr in request.date_ranges)
+        ttl = CACHE_TTL_CLOSED if closed else CACHE_TTL
+
+    now = time.monotonic()
+    with _report_cache_lock:
+        entry = _report_cache.get(key)
+        if entry and entry[0] > now:
+            return entry[1]
+
+    response = _call_with_backoff(client.run_report, request)
+
+    with _report_cache_lock:
+        _report_cache.pop(key, None)
+        while len(_report_cache) >= CACHE_MAX_ENTRIES:
+            del _report_cache[next(iter(_report_cache))]
+        _report_cache[key] = (now + ttl, response)
+    return response
+
+
+def run_report_paged(client, request, page_size=REPORT_PAGE_SIZE):
+    """Run a report in pages of at most page_size rows, up to request.limit rows.
+
+    Returns the first page's response (for headers and row count) and an
+    iterator over all rows that fetches later pages lazily, so only one page
+    of responses is alive at a time. Requests that fit in a single page go
+    through the response cache. Anything that may span several pages is
+    fetched live throughout, so a stale cached first page is never spliced
+    onto fresh later ones.
+    """
+    total = request.limit
+    if 0 < total <= page_size:
+        first = _run_cached(client, request)
+        return first, _response_rows(first)
+
+    request.limit = min(total, page_size) if total else page_size
+    first = _call_with_backoff(client.run_report, request)
+
+    def rows():
+        response, fetched = first, 0
+        while True:
+            yield from _response_rows(response)
+            fetched += len(response.rows)
+            if (len(response.rows) < request.limit or fetched >= first.row_count
+                    or (total and fetched >= total)):
+                return
+            request.offset = fetched
+            request.limit = min(total - fetched, page_size) if total else page_size
+            response = _call_with_backoff(client.run_report, request)
+
+    return first, rows()
+
+
+def _to_json(headers, rows):
+    """Render rows as an indented JSON array of objects, using orjson when available.
+
+    Records are encoded one at a time into a single text buffer, so no
+    list of row dicts is built alongside the output.
+    """
+    if orjson is not None:
+        def encode(record):
+            return orjson.dumps(record, option=orjson.OPT_INDENT_2).decode()
+    else:
+        def encode(record):
+            return json.dumps(record, indent=2, ensure_ascii=False)
+
+    header_keys = tuple(headers)
+    buf = io.StringIO()
+    for i, row in enumerate(rows):
+        # Nest each record one level inside the array, as json.dumps(list, indent=2) would.
+        buf.write(",\n  " if i else "[\n  ")
+        buf.write(encode(dict(zip(header_keys, row))).replace("\n", "\n  "))
+    return buf.getvalue() + "\n]" if buf.tell() else "[]"
+
+
+def _to_csv(headers, rows):
+    """Render headers and an iterable of rows as CSV, quoting where needed."""
+    buf = io.StringIO()
+    writer = csv.writer(buf, lineterminator="\n")
+    writer.writerow(headers)
+    writer.writerows(rows)
+    return buf.getvalue().rstrip("\n")
+
+
+def _to_arrow(headers, rows):
+    """Serialize rows as an Arrow IPC stream holding a single RecordBatch."""
+    if pyarrow is None:
+        raise RuntimeError("pyarrow is required for --output arrow (pip install pyarrow)")
+
+    rows = list(rows)
+    columns = [list(col) for col in zip(*rows)] if rows else [[] for _ in headers]
+    arrays = []
+    for values in columns:
+        array = pyarrow.array(values, type=pyarrow.string())
+        # Dimensions such as country or deviceCategory repeat heavily;
+        # dictionary-encode any column with few distinct values.
+        if len(set(values)) * 2 <= len(values):
+            array = array.dictionary_encode()
+        arrays.append(array)
+
+    batch = pyarrow.RecordBatch.from_arrays(arrays, names=headers)
+    sink = pyarrow.BufferOutputStream()
+    with pyarrow.ipc.new_stream(sink, batch.schema) as writer:
+        writer.write_batch(batch)
+    return sink.getvalue().to_pybytes()
+
+
+def _render(headers, rows, output="table", row_count=None):
+    """Render headers and rows (an iterable of lists of strings) as table, json, csv or arrow."""
+    if output == "arrow":
+        return _to_arrow(headers, rows)
+
+    if output == "csv":
+        return _to_csv(headers, rows)
 
     if output == "json":
-        result = []
-        for row in rows:
-            result.append(dict(zip(headers, row)))
-        return json.dumps(result, indent=2)
+        return _to_json(headers, rows)
+
+    # Table: take every cell length in one C-level map over the flattened
+    # rows, then each column's width is the max of a strided slice.
+    rows = list(rows)
+    ncols = len(headers)
+    lengths = list(map(len, chain.from_iterable(rows)))
+    col_widths = [max(len(h), max(lengths[i::ncols], default=0)) for i, h in enumerate(headers)]
 
-    elif output == "csv":
-        lines = [",".join(headers)]
-        for row in rows:
-            lines.append(",".join(row))
-        return "\n".join(lines)
+    separator = "+" + "+".join("-" * (w + 2) for w in col_widths) + "+"
+    # str.ljust pads each cell in C without going through the format-spec parser.
+    lines = [separator, "| " + " | ".join(map(str.ljust, headers, col_widths)) + " |", separator]
+    lines.extend("| " + " | ".join(map(str.ljust, row, col_widths)) + " |" for row in rows)
+    lines.append(separator)
 
-    else:  # table
-        col_widths = [len(h) for h in headers]
-        for row in rows:
-            for i, val in enumerate(row):
-                col_widths[i] = max(col_widths[i], len(str(val)))
+    if row_count:
+        lines.append(f"\nTotal rows: {row_count}")
 
-        separator = "+" + "+".join("-" * (w + 2) for w in col_widths) + "+"
-        header_row = "|" + "|".join(f" {h:<{col_widths[i]}} " for i, h in enumerate(headers)) + "|"
+    return "\n".join(lines)
 
-        lines = [separator, header_row, separator]
-        for row in rows:
-            line = "|" + "|".join(f" {str(v):<{col_widths[i]}} " for i, v in enumerate(row)) + "|"
-            lines.append(line)
-        lines.append(separator)
 
-        if response.row_count:
-            lines.append(f"\nTotal rows: {response.row_count}")
+def _response_headers(response):
+    """Dimension then metric header names of a GA4 report response."""
+    headers = list(map(_get_name, response.dimension_headers))
+    headers.extend(map(_get_name, response.metric_headers))
+    return headers
 
-        return "\n".join(lines)
+
+def _response_rows(response):
+    """Yield each response row as a list of values; GA4 returns them all as strings."""
+    for row in response.rows:
+        values = list(map(_get_value, row.dimension_values))
+        values.extend(map(_get_value, row.metric_values))
+        yield values
+
+
+def format_response(response, output="table"):
+    """Format the API response into the desired output format."""
+    return _render(_response_headers(response), _response_rows(response), output, response.row_count)
 
 
 def report_properties(client, args):
     """List all GA4 properties the service account can access."""
-    from google.analytics.admin_v1alpha import AnalyticsAdminServiceClient
-
-    os.environ["GOOGLE_APPLICATION_CREDENTIALS"] = CREDENTIALS_PATH
-    admin_client = AnalyticsAdminServiceClient()
+    admin_client = get_admin_client()
 
     accounts = list(admin_client.list_account_summaries())
     if not accounts:
@@ -137,160 +436,188 @@ def report_properties(client, args):
     if not rows:
         return "No properties found."
 
-    if args.output == "json":
-        result = [dict(zip(headers, row)) for row in rows]
-        return json.dumps(result, indent=2)
-    elif args.output == "csv":
-        lines = [",".join(headers)]
-        for row in rows:
-            lines.append(",".join(row))
-        return "\n".join(lines)
-    else:
-        col_widths = [len(h) for h in headers]
-        for row in rows:
-            for i, val in enumerate(row):
-                col_widths[i] = max(col_widths[i], len(str(val)))
-        separator = "+" + "+".join("-" * (w + 2) for w in col_widths) + "+"
-        header_row = "|" + "|".join(f" {h:<{col_widths[i]}} " for i, h in enumerate(headers)) + "|"
-        lines = [separator, header_row, separator]
-        for row in rows:
-            line = "|" + "|".join(f" {str(v):<{col_widths[i]}} " for i, v in enumerate(row)) + "|"
-            lines.append(line)
-        lines.append(separator)
-        return "\n".join(lines)
+    return _render(headers, rows, args.output)
 
 
 def report_overview(client, args):
     """High-level site overview."""
     property_id = get_property_id(args)
-    request = build_request(
-        property_id,
-        metrics=["totalUsers", "newUsers", "sessions", "screenPageViews",
-                 "averageSessionDuration", "engagementRate", "bounceRate"],
-        dimensions=[],
+    request = build_template_request(
+        _OVERVIEW_TEMPLATE, property_id,
         days=args.days, start=args.start, end=args.end, limit=1,
     )
-    response = client.run_report(request)
+    response = _run_cached(client, request)
     return format_response(response, args.output)
 
 
+def report_multi_overview(client, args):
+    """Site overview for several properties side by side."""
+    property_ids = [p.strip() for p in (getattr(args, "property_ids", None) or "").split(",") if p.strip()]
+    if not property_ids:
+        return "Error: --property-ids required for multi_overview report (comma-separated)"
+    if args.output != "table":
+        return "Error: the multi_overview report only supports table output"
+
+    # BatchRunReportsRequest only accepts reports for a single property, so
+    # each property gets its own RPC; they run concurrently on a small pool.
+    def overview_for(pid):
+        return report_overview(client, argparse.Namespace(**{**vars(args), "property_id": pid}))
+
+    with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(property_ids))) as executor:
+        results = list(executor.map(overview_for, property_ids))
+
+    return "\n\n".join(f"Property {pid}:\n{result}" for pid, result in zip(property_ids, results))
+
+
 def report_pages(client, args):
     """Top pages by views."""
     property_id = get_property_id(args)
-    request = build_request(
-        property_id,
-        metrics=["screenPageViews", "totalUsers", "averageSessionDuration"],
-        dimensions=["pagePath", "pageTitle"],
+    request = build_template_request(
+        _PAGES_TEMPLATE, property_id,
         days=args.days, start=args.start, end=args.end, limit=args.limit,
-        order_by_metric="screenPageViews",
     )
-    response = client.run_report(request)
+    response = _run_cached(client, request)
     return format_response(response, args.output)
 
 
 def report_sources(client, args):
     """Traffic sources."""
     property_id = get_property_id(args)
-    request = build_request(
-        property_id,
-        metrics=["sessions", "totalUsers", "engagementRate", "conversions"],
-        dimensions=["sessionSource", "sessionMedium"],
+    request = build_template_request(
+        _SOURCES_TEMPLATE, property_id,
         days=args.days, start=args.start, end=args.end, limit=args.limit,
-        order_by_metric="sessions",
     )
-    response = client.run_report(request)
+    response = _run_cached(client, request)
     return format_response(response, args.output)
 
 
 def report_countries(client, args):
     """Geographic breakdown."""
     property_id = get_property_id(args)
-    request = build_request(
-        property_id,
-        metrics=["sessions", "totalUsers", "engagementRate"],
-        dimensions=["country"],
+    request = build_template_request(
+        _COUNTRIES_TEMPLATE, property_id,
         days=args.days, start=args.start, end=args.end, limit=args.limit,
-        order_by_metric="sessions",
     )
-    response = client.run_report(request)
+    response = _run_cached(client, request)
     return format_response(response, args.output)
 
 
 def report_devices(client, args):
     """Device category breakdown."""
     property_id = get_property_id(args)
-    request = build_request(
-        property_id,
-        metrics=["sessions", "totalUsers", "engagementRate"],
-        dimensions=["deviceCategory"],
+    request = build_template_request(
+        _DEVICES_TEMPLATE, property_id,
         days=args.days, start=args.start, end=args.end, limit=args.limit,
-        order_by_metric="sessions",
     )
-    response = client.run_report(request)
+    response = _run_cached(client, request)
     return format_response(response, args.output)
 
 
+def report_dashboard(client, args):
+    """Overview, top pages and traffic sources in one call."""
+    get_property_id(args)
+    if args.output != "table":
+        return "Error: the dashboard report only supports table output"
+    sections = [
+        ("Overview", report_overview),
+        ("Top pages", report_pages),
+        ("Traffic sources", report_sources),
+    ]
+
+    # The sub-reports are independent, so issue their RPCs concurrently over
+    # the shared client; wall time is the slowest report rather than the sum.
+    with ThreadPoolExecutor(max_workers=len(sections)) as executor:
+        futures = [(title, executor.submit(report, client, args)) for title, report in sections]
+        return "\n\n".join(f"{title}:\n{future.result()}" for title, future in futures)
+
+
+def _project(rows, key_len, limit):
+    """Collapse joint-breakdown rows onto their first key_len dimensions.
+
+    Rows are [*dimensions, views]; views are summed per group and the top
+    `limit` groups by views are returned.
+    """
+    def key(row):
+        return row[:key_len]
+
+    projected = [
+        (group_key, sum(int(row[key_len]) for row in group))
+        for group_key, group in groupby(sorted(rows, key=key), key=key)
+    ]
+    projected.sort(key=lambda item: item[1], reverse=True)
+    return [group_key + [str(views)] for group_key, views in projected[:limit]]
+
+
+def report_pages_and_sources(client, args):
+    """Top pages and traffic sources by page views, from a single joint request.
+
+    Only screenPageViews is additive across the page x source breakdown, so
+    it is the only metric projected; use the pages or sources report for
+    sessions and users. The joint request is capped at one page of
+    REPORT_PAGE_SIZE rows, so on high-cardinality properties the totals are
+    approximate and the output says so.
+    """
+    property_id = get_property_id(args)
+    if args.output != "table":
+        return "Error: the pages_and_sources report only supports table output"
+
+    request = build_template_request(
+        _PAGES_AND_SOURCES_TEMPLATE, property_id,
+        days=args.days, start=args.start, end=args.end, limit=REPORT_PAGE_SIZE,
+    )
+    response = _run_cached(client, request)
+    rows = list(_response_rows(response))
+
+    # Joint rows are [pagePath, sessionSource, sessionMedium, screenPageViews].
+    pages = _project([row[:1] + row[3:] for row in rows], 1, args.limit)
+    sources = _project([row[1:] for row in rows], 2, args.limit)
+
+    sections = [
+        "Top pages:\n" + _render(["pagePath", "screenPageViews"], pages),
+        "Traffic sources:\n" + _render(["sessionSource", "sessionMedium", "screenPageViews"], sources),
+    ]
+    # GA4 also folds low-volume rows into "(other)" once a breakdown exceeds
+    # its cardinality limits; either way the projected sums are partial.
+    if response.row_count > len(rows):
+        caveat = f"projected from the top {len(rows)} of {response.row_count} page/source combinations"
+    elif any("(other)" in row[:3] for row in rows):
+        caveat = 'GA4 grouped some page/source combinations into "(other)"'
+    else:
+        caveat = None
+    if caveat:
+        sections.append(
+            f"Note: {caveat}, so page view totals are approximate. "
+            "Use the pages and sources reports for exact figures."
+        )
+    return "\n\n".join(sections)
+
+
 def report_daily(client, args):
     """Day-by-day trend."""
     property_id = get_property_id(args)
-    request = build_request(
-        property_id,
-        metrics=["totalUsers", "sessions", "screenPageViews"],
-        dimensions=["date"],
+    request = build_template_request(
+        _DAILY_TEMPLATE, property_id,
         days=args.days, start=args.start, end=args.end, limit=args.days or 30,
     )
-    from google.analytics.data_v1beta.types import OrderBy
-    request.order_bys = [
-        OrderBy(dimension=OrderBy.DimensionOrderBy(dimension_name="date"), desc=False)
-    ]
-    response = client.run_report(request)
+    response = _run_cached(client, request)
     return format_response(response, args.output)
 
 
 def report_realtime(client, args):
     """Realtime active users."""
     property_id = get_property_id(args)
-    from google.analytics.data_v1beta.types import (
-        RunRealtimeReportRequest, Metric, Dimension
-    )
     request = RunRealtimeReportRequest(
         property=f"properties/{property_id}",
         metrics=[Metric(name="activeUsers")],
         dimensions=[Dimension(name="unifiedScreenName")],
         limit=args.limit,
     )
-    response = client.run_realtime_report(request)
+    response = _call_with_backoff(client.run_realtime_report, request)
 
-    headers = [h.name for h in response.dimension_headers] + [h.name for h in response.metric_headers]
-    rows = []
-    for row in response.rows:
-        values = [dv.value for dv in row.dimension_values] + [mv.value for mv in row.metric_values]
-        rows.append(values)
-
-    if not rows:
+    if not response.rows:
         return "No active users right now."
 
-    if args.output == "json":
-        result = [dict(zip(headers, row)) for row in rows]
-        return json.dumps(result, indent=2)
-    elif args.output == "csv":
-        lines = [",".join(headers)]
-        for row in rows:
-            lines.append(",".join(row))
-        return "\n".join(lines)
-    else:
-        col_widths = [len(h) for h in headers]
-        for row in rows:
-            for i, val in enumerate(row):
-                col_widths[i] = max(col_widths[i], len(str(val)))
-        separator = "+" + "+".join("-" * (w + 2) for w in col_widths) + "+"
-        header_row = "|" + "|".join(f" {h:<{col_widths[i]}} " for i, h in enumerate(headers)) + "|"
-        lines = [separator, header_row, separator]
-        for row in rows:
-            line = "|" + "|".join(f" {str(v):<{col_widths[i]}} " for i, v in enumerate(row)) + "|"
-            lines.append(line)
-        lines.append(separator)
-        return "\n".join(lines)
+    return _render(_response_headers(response), _response_rows(response), args.output)
 
 
 def report_custom(client, args):
@@ -309,17 +636,20 @@ def report_custom(client, args):
         days=args.days, start=args.start, end=args.end, limit=args.limit,
         order_by_metric=metrics[0],
     )
-    response = client.run_report(request)
-    return format_response(response, args.output)
+    response, rows = run_report_paged(client, request)
+    return _render(_response_headers(response), rows, args.output, response.row_count)
 
 
 REPORTS = {
     "properties": report_properties,
     "overview": report_overview,
+    "multi_overview": report_multi_overview,
     "pages": report_pages,
     "sources": report_sources,
     "countries": report_countries,
     "devices": report_devices,
+    "dashboard": report_dashboard,
+    "pages_and_sources": report_pages_and_sources,
     "daily": report_daily,
     "realtime": report_realtime,
     "custom": report_custom,
@@ -330,11 +660,13 @@ def main():
     parser = argparse.ArgumentParser(description="Query Google Analytics 4 data")
     parser.add_argument("--report", required=True, choices=REPORTS.keys(), help="Report type")
     parser.add_argument("--property-id", help="GA4 property ID (overrides GA4_PROPERTY_ID env var)")
+    parser.add_argument("--property-ids", help="Comma-separated GA4 property IDs (for multi_overview report)")
     parser.add_argument("--days", type=int, default=30, help="Lookback period in days (default: 30)")
     parser.add_argument("--start", help="Start date (YYYY-MM-DD), overrides --days")
     parser.add_argument("--end", help="End date (YYYY-MM-DD), defaults to today")
     parser.add_argument("--limit", type=int, default=10, help="Max rows (default: 10)")
-    parser.add_argument("--output", choices=["table", "json", "csv"], default="table", help="Output format")
+    parser.add_argument("--output", choices=["table", "json", "csv", "arrow"], default="table",
+                        help="Output format (arrow writes an Arrow IPC stream and needs pyarrow)")
     parser.add_argument("--metrics", help="Comma-separated metrics (for custom report)")
     parser.add_argument("--dimensions", help="Comma-separated dimensions (for custom report)")
 
@@ -343,7 +675,10 @@ def main():
     try:
         client = get_client()
         result = REPORTS[args.report](client, args)
-        print(result)
+        if isinstance(result, bytes):
+            sys.stdout.buffer.write(result)
+        else:
+            print(result)
     except Exception as e:
         print(f"Error: {e}", file=sys.stderr)
         sys.exit(1)